@@ -1,6 +1,12 @@
+import fcntl
+import os
 import pathlib
 import shutil
+import stat
 import subprocess
+import typing as T
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from . import ParsedVersion
 
@@ -8,23 +14,47 @@ from . import ParsedVersion
 def create_zipped_deb_packages(dist_root: pathlib.Path, app_version: ParsedVersion):
     deb_folder = dist_root / "debs"
     deb_folder.mkdir(exist_ok=True)
-    for folder in dist_root.glob("Pupil */"):
-        deb_pkg = create_deb_package(dist_root, folder.name, app_version)
+    app_names = [folder.name for folder in dist_root.glob("Pupil */")]
+
+    # remove staging dirs left over by previous runs concurrently
+    stale_deb_roots = [
+        deb_root
+        for deb_root in (
+            get_deb_root(dist_root, app_name, app_version) for app_name in app_names
+        )
+        if deb_root.exists()
+    ]
+    if stale_deb_roots:
+        with ThreadPoolExecutor(max_workers=len(stale_deb_roots)) as executor:
+            list(executor.map(remove_tree, stale_deb_roots))
+
+    for app_name in app_names:
+        deb_pkg = create_deb_package(dist_root, app_name, app_version)
         deb_pkg.rename(deb_folder / deb_pkg.name)
 
     shutil.make_archive(str(dist_root), "zip", deb_folder)
 
 
+def get_package_name(app_name: str) -> str:
+    return app_name.lower().replace(" ", "_")
+
+
+def get_deb_root(
+    dist_root: pathlib.Path, app_name: str, app_version: ParsedVersion
+) -> pathlib.Path:
+    deb_folder = f"{get_package_name(app_name)}_v{app_version}"
+    return (dist_root / deb_folder).resolve()
+
+
 def create_deb_package(
     dist_root: pathlib.Path, app_name: str, app_version: ParsedVersion
 ) -> pathlib.Path:
     # lets build the structure for our deb package_name.
 
-    package_name = app_name.lower().replace(" ", "_")
-    deb_folder = f"{package_name}_v{app_version}"
-    deb_root = (dist_root / deb_folder).resolve()
+    package_name = get_package_name(app_name)
+    deb_root = get_deb_root(dist_root, app_name, app_version)
     if deb_root.exists():
-        shutil.rmtree(str(deb_root))
+        remove_tree(deb_root)
 
     control = deb_root / "DEBIAN" / "control"
     desktop = deb_root / "usr" / "share" / "applications" / f"{package_name}.desktop"
@@ -32,19 +62,23 @@ def create_deb_package(
     opt_dir = deb_root / "opt"
     ico_dir = deb_root / "usr" / "share" / "icons" / "hicolor" / "scalable" / "apps"
 
-    control.parent.mkdir(mode=0o755, exist_ok=True, parents=True)
-    starter.parent.mkdir(mode=0o755, exist_ok=True, parents=True)
-    desktop.parent.mkdir(mode=0o755, exist_ok=True, parents=True)
-    ico_dir.mkdir(mode=0o755, exist_ok=True, parents=True)
+    # The umask is cleared so that it does not strip any of the requested bits.
+    with umask(0):
+        make_dirs(
+            control.parent, starter.parent, desktop.parent, ico_dir, opt_dir, mode=0o755
+        )
 
     startup_WM_class = app_name
     if startup_WM_class == "Pupil Capture":
         startup_WM_class += " - World"
 
     # DEB control file
-    with control.open("w") as f:
-        dist_size = sum(f.stat().st_size for f in dist_root.rglob("*"))
-        content = f"""\
+    app_dir = dist_root / app_name
+    app_listing = scan_tree(app_dir)
+    dist_size = sum(app_listing.file_sizes)
+    # See this link regarding the calculation of the Installed-Size field
+    # https://www.debian.org/doc/debian-policy/ch-controlfields.html#installed-size
+    control_content = f"""\
 Package: {package_name.replace("_", "-")}
 Version: {app_version}
 Architecture: amd64
@@ -53,27 +87,18 @@ Priority: optional
 Description: {app_name} - Find more information on https://docs.pupil-labs.com/core/
 Installed-Size: {round(dist_size / 1024)}
 """
-        # See this link regarding the calculation of the Installed-Size field
-        # https://www.debian.org/doc/debian-policy/ch-controlfields.html#installed-size
-        f.write(content)
-    control.chmod(0o644)
 
     # bin_starter script
-
-    with starter.open("w") as f:
-        content = f'''\
+    starter_content = f'''\
 #!/bin/sh
 exec /opt/{package_name}/{package_name} "$@"'''
-        f.write(content)
-    starter.chmod(0o755)
 
     # .desktop entry
     # ATTENTION: In order for the bundle icon to display correctly
     # two things are necessary:
     # 1. Icon needs to be the icon's base name/stem
     # 2. The window title must be equivalent to StartupWMClass
-    with desktop.open("w") as f:
-        content = f"""\
+    desktop_content = f"""\
 [Desktop Entry]
 Version={app_version}
 Type=Application
@@ -89,8 +114,12 @@ StartupWMClass={startup_WM_class}
 [Desktop Action Terminal]
 Name=Open in Terminal
 Exec=x-terminal-emulator -e {package_name}"""
-        f.write(content)
-    desktop.chmod(0o644)
+
+    # Create the files with their final mode instead of chmod-ing them afterwards.
+    with umask(0):
+        write_file(control, control_content, mode=0o644)
+        write_file(starter, starter_content, mode=0o755)
+        write_file(desktop, desktop_content, mode=0o644)
 
     svg_file_name = f"{package_name.replace('_', '-')}.svg"
     src_path = pathlib.Path("icons", svg_file_name)
@@ -99,17 +128,197 @@ Exec=x-terminal-emulator -e {package_name}"""
     dst_path.chmod(0o755)
 
     # copy the actual application
-    shutil.copytree(str(dist_root / app_name), str(opt_dir / package_name))
-    for f in opt_dir.rglob("*"):
-        if f.is_file():
-            if f.name == package_name:
-                f.chmod(0o755)
-            else:
-                f.chmod(0o644)
-        elif f.is_dir():
-            f.chmod(0o755)
-    opt_dir.chmod(0o755)
-
-    subprocess.call(["fakeroot", "dpkg-deb", "--build", deb_root])
-    shutil.rmtree(str(deb_root))
+    file_modes = get_target_modes(app_listing, executable_name=package_name)
+    copy_tree(app_dir, opt_dir / package_name, app_listing, file_modes)
+
+    # Let dpkg-deb compress the payload using all cores. The limit is passed via the
+    # environment, since older dpkg-deb versions do not know the --threads-max flag.
+    env = {**os.environ, "DPKG_DEB_THREADS_MAX": str(os.cpu_count() or 1)}
+    subprocess.check_call(
+        ["fakeroot", "dpkg-deb", "-Zxz", "--build", deb_root], env=env
+    )
+    remove_tree(deb_root)
     return deb_root.with_name(deb_root.name + ".deb")
+
+
+def remove_tree(path: pathlib.Path):
+    # rm unlinks the staging tree in C, which is considerably faster than the
+    # per-entry recursion of shutil.rmtree for trees of this size
+    subprocess.check_call(["rm", "-rf", "--", str(path)])
+
+
+def make_dirs(*paths: pathlib.Path, mode: int):
+    """Creates the given directories including missing parents.
+
+    Shared ancestors are only created once, parents before their children.
+    """
+    missing = set()
+    for path in paths:
+        for directory in (path, *path.parents):
+            if directory in missing or directory.exists():
+                break
+            missing.add(directory)
+    for directory in sorted(missing, key=lambda d: len(d.parts)):
+        directory.mkdir(mode=mode)
+
+
+@contextmanager
+def umask(mask: int):
+    previous = os.umask(mask)
+    try:
+        yield
+    finally:
+        os.umask(previous)
+
+
+def write_file(path: pathlib.Path, content: str, mode: int):
+    # O_EXCL: the mode is only applied when the file is newly created
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, "w") as f:
+        f.write(content)
+
+
+class TreeListing(T.NamedTuple):
+    """Flat listing of a directory tree with paths relative to its root.
+
+    The root directory itself is listed as the first directory with path "".
+    Symbolic links are followed and listed as the entry they point to.
+    """
+
+    dirs: list[str]
+    dir_modes: list[int]
+    files: list[str]
+    file_modes: list[int]
+    file_sizes: list[int]
+
+
+def scan_tree(root: pathlib.Path) -> TreeListing:
+    """Walks `root` once and records everything needed to size, copy and chmod it."""
+    listing = TreeListing([""], [stat.S_IMODE(root.stat().st_mode)], [], [], [])
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as it:
+            for entry in it:
+                rel_path = os.path.join(rel_dir, entry.name)
+                # like shutil.copytree(symlinks=False), the packaged bundle contains
+                # the link targets, such that no link can dangle in the .deb
+                st = entry.stat()
+                if stat.S_ISDIR(st.st_mode):
+                    listing.dirs.append(rel_path)
+                    listing.dir_modes.append(stat.S_IMODE(st.st_mode))
+                    stack.append(rel_path)
+                else:
+                    listing.files.append(rel_path)
+                    listing.file_modes.append(stat.S_IMODE(st.st_mode))
+                    listing.file_sizes.append(st.st_size)
+    return listing
+
+
+def get_target_modes(listing: TreeListing, executable_name: str) -> list[int]:
+    """Returns the packaged mode for each file in `listing`.
+
+    The executable gets 0o755, all other files 0o644.
+    """
+    return [
+        0o755 if os.path.basename(rel_path) == executable_name else 0o644
+        for rel_path in listing.files
+    ]
+
+
+def copy_tree(
+    src: pathlib.Path,
+    dst: pathlib.Path,
+    listing: TreeListing,
+    file_modes: list[int],
+    max_workers: int = 8,
+):
+    """Mirror the tree at `src`, as described by `listing`, in `dst`.
+
+    Directories get mode 0o755 and each file the corresponding mode in `file_modes`.
+    dpkg-deb only reads the staged payload, so files that already have their target
+    mode are hardlinked instead of copied. All other files are copied, which keeps
+    the following chmod from modifying the source tree. If linking fails, e.g.
+    because `dst` is located on another file system, the file is copied as well.
+
+    The directory structure is created upfront, the file transfers are then
+    distributed across a thread pool.
+    """
+    for rel_path in listing.dirs:
+        os.makedirs(os.path.join(dst, rel_path), exist_ok=True)
+
+    def transfer(rel_path: str, mode: int, target_mode: int):
+        src_path = os.path.join(src, rel_path)
+        dst_path = os.path.join(dst, rel_path)
+        if mode == target_mode:
+            try:
+                # link(2) does not follow symlinks, so link to the target itself
+                os.link(os.path.realpath(src_path), dst_path)
+                return
+            except OSError:
+                pass
+        copy_file(src_path, dst_path)
+        if mode != target_mode:
+            os.chmod(dst_path, target_mode)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consume the results to propagate exceptions from the workers
+        list(executor.map(transfer, listing.files, listing.file_modes, file_modes))
+    # copy directory metadata last, since populating a directory changes its mtime
+    for rel_path, mode in zip(reversed(listing.dirs), reversed(listing.dir_modes)):
+        dst_path = os.path.join(dst, rel_path)
+        shutil.copystat(os.path.join(src, rel_path), dst_path)
+        if mode != 0o755:
+            os.chmod(dst_path, 0o755)
+
+
+# ioctl request to share the source's extents with the destination (reflink)
+FICLONE = 0x40049409
+
+
+def copy_file(src: str, dst: str):
+    """Like shutil.copy2, but without moving the file data through userspace.
+
+    As with `cp --reflink=auto`, the file is cloned on copy-on-write file systems
+    (btrfs, XFS) such that no data is copied at all. Otherwise the data is copied
+    in the kernel with copy_file_range, falling back to sendfile where that is not
+    supported, e.g. across file systems on older kernels.
+
+    The source is marked for sequential access, which widens the kernel readahead
+    window. Afterwards both files are dropped from the page cache, so that copying
+    the bundle does not evict everything else from it.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        shutil.copy2(src, dst)
+        return
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except OSError:
+            size = os.fstat(src_fd).st_size
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            copy_file_data(src_fd, dst_fd, size)
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    shutil.copystat(src, dst)
+
+
+def copy_file_data(src_fd: int, dst_fd: int, size: int):
+    use_copy_file_range = hasattr(os, "copy_file_range")
+    offset = 0
+    while offset < size:
+        if use_copy_file_range:
+            try:
+                sent = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+            except OSError:
+                # sendfile writes at the file position, which copy_file_range kept
+                use_copy_file_range = False
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                continue
+        else:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
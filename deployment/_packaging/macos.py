@@ -3,6 +3,7 @@ import logging
 import os
 import pathlib
 import subprocess
+import typing as T
 
 from . import ParsedVersion
 
@@ -64,22 +65,42 @@ def create_dmg(
 
 def get_size(start_path: str | pathlib.Path = "."):
     total_size = 0
-    for dirpath, _, filenames in os.walk(start_path):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            # skip if it is symbolic link
-            if not os.path.islink(fp):
-                total_size += os.path.getsize(fp)
+    stack = [os.fspath(start_path)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                # skip symbolic links
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
 
     return total_size
 
 
 def sign_app(path: pathlib.Path):
-    for obj in path.rglob(".dylibs/*.dylib"):
+    for obj in find_dylibs(path):
         sign_object(obj)
     sign_object(path)
 
 
+def find_dylibs(root: pathlib.Path) -> T.Iterator[pathlib.Path]:
+    """Yields all *.dylib files located directly in a .dylibs directory."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                stack.append(entry.path)
+                if entry.name == ".dylibs":
+                    with os.scandir(entry.path) as libs:
+                        dylibs = [
+                            lib.path for lib in libs if lib.name.endswith(".dylib")
+                        ]
+                    yield from map(pathlib.Path, dylibs)
+
+
 def sign_object(path: pathlib.Path):
     logging.info(f"Attempting to sign '{path}'")
     subprocess.check_call(
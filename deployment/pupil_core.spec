@@ -38,6 +38,9 @@ def main():
     current_platform = SupportedPlatform(platform.system())
     deployment_root = pathlib.Path(cwd)
 
+    # Each call invokes `git describe`, so only query the version once
+    app_version = pupil_version()
+
     logging.debug(f"Writing version file to {DISTPATH}")
     version_file_path: pathlib.Path = write_version_file(DISTPATH)
 
@@ -179,7 +182,7 @@ def main():
             collection,
             name=f"{app_name}.app",
             icon=icon_path,
-            version=str(pupil_version()),
+            version=str(app_version),
             bundle_identifier=(
                 f"com.pupil-labs.core.{app_name.lower().replace(' ','_')}"
             ),
@@ -190,7 +193,7 @@ def main():
         SupportedPlatform.macos: macos.package_bundles_as_dmg,
         SupportedPlatform.linux: linux.create_zipped_deb_packages,
     }
-    bundle_postprocessing[current_platform](pathlib.Path(DISTPATH), pupil_version())
+    bundle_postprocessing[current_platform](pathlib.Path(DISTPATH), app_version)
 
 
 def apriltag_relative_path(absolute_path: pathlib.Path):
@@ -119,6 +119,7 @@ from time import time
 # networking
 import zmq
 import zmq_tools
+from delayed_notifications import Delayed_Notifications
 
 # os utilities
 from os_utils import Prevent_Idle_Sleep
@@ -157,52 +158,38 @@ def launcher():
     Reacts to notifications:
        ``launcher_process.should_stop``: Stops the launcher process
        ``eye_process.should_start``: Starts the eye process
-    """
-
-    # Reliable msg dispatch to the IPC via push bridge.
-    # Defines a nested function pull_pub, which is responsible for receiving messages from a ZMQ PULL socket 
-    # and publishing them to a ZMQ PUB socket. 
-    # This function essentially acts as a message relay. 消息中继
-    def pull_pub(ipc_pub_url, pull):
-        # Setup IPC to publish messages to other processes.
-        ctx = zmq.Context.instance()
-        pub = ctx.socket(zmq.PUB)
-        pub.connect(ipc_pub_url)
+       ``eye_process.stopped``: Acknowledges the stop to the eye process
 
-        while True:
-            m = pull.recv_multipart()
-            pub.send_multipart(m)
+    Emits notifications:
+        ``eye_process.stopped.ack.<eye id>``: Eye process stop was received
+    """
 
     # The delay proxy handles delayed notififications.
     # delay_proxy, handles delayed notifications. It listens for notifications and dispatches them after a specified delay.
-    def delay_proxy(ipc_pub_url, ipc_sub_url):
-        ctx = zmq.Context.instance()
+    def delay_proxy(ctx, ipc_pub_url, ipc_sub_url):
         sub = zmq_tools.Msg_Receiver(ctx, ipc_sub_url, ("delayed_notify",))
         pub = zmq_tools.Msg_Dispatcher(ctx, ipc_pub_url)
         poller = zmq.Poller()
         poller.register(sub.socket, zmq.POLLIN)
-        waiting_notifications = {}
-
-        TOPIC_CUTOFF = len("delayed_")
+        delayed_notifications = Delayed_Notifications()
 
         while True:
-            if poller.poll(timeout=250):
+            # wait for new notifications at most until the next one is due
+            timeout = 250
+            time_to_next = delayed_notifications.seconds_until_next(time())
+            if time_to_next is not None:
+                timeout = min(timeout, time_to_next * 1000)
+            if poller.poll(timeout=timeout):
                 # Recv new delayed notification and store it.
                 topic, n = sub.recv()
-                n["__notify_time__"] = time() + n["delay"]
-                waiting_notifications[n["subject"]] = n
-            # When a notifications time has come, pop from dict and send it as notification
-            for s, n in list(waiting_notifications.items()):
-                if n["__notify_time__"] < time():
-                    n["topic"] = n["topic"][TOPIC_CUTOFF:]
-                    del n["__notify_time__"]
-                    del n["delay"]
-                    del waiting_notifications[s]
-                    pub.notify(n)
+                delayed_notifications.add(n, time())
+            # When a notifications time has come, send it as notification
+            for n in delayed_notifications.pop_due(time()):
+                pub.notify(n)
 
     # Recv log records from other processes.
     # This function sets up logging for the application. It configures logging handlers, formats, and levels, and receives log messages from other processes over a ZMQ socket.
-    def log_loop(ipc_sub_url, log_level_debug):
+    def log_loop(ctx, ipc_sub_url, log_level_debug):
         import logging
 
         from rich.logging import RichHandler
@@ -235,7 +222,7 @@ def launcher():
 
         logger.addHandler(ch)
         # IPC setup to receive log messages. Use zmq_tools.ZMQ_handler to send messages to here.
-        sub = zmq_tools.Msg_Receiver(zmq.Context(), ipc_sub_url, topics=("logging",))
+        sub = zmq_tools.Msg_Receiver(ctx, ipc_sub_url, topics=("logging",))
         while True:
             topic, msg = sub.recv()
             record = logging.makeLogRecord(msg)
@@ -246,7 +233,9 @@ def launcher():
     # eye_procs_alive is a list of boolean values that indicate whether an eye process is running or not.
     eye_procs_alive = Value(c_bool, 0), Value(c_bool, 0)
 
-    zmq_ctx = zmq.Context()
+    # A single context for the backbone, the helper threads and the launcher itself.
+    # It carries all IPC traffic, hence the second I/O thread.
+    zmq_ctx = zmq.Context(io_threads=2)
 
     # Let the OS choose the IP and PORT
     ipc_pub_url = "tcp://*:*"
@@ -286,33 +275,44 @@ def launcher():
     )
     ipc_backbone_thread.start()
 
-        # Runs a thread that pulls messages from a PULL socket and publishes them to a PUB socket. This is a part of the IPC mechanism to relay messages from one part of the system to another.
-    pull_pub = Thread(target=pull_pub, args=(ipc_pub_url, pull_socket), daemon=True)
+    # Reliable msg dispatch to the IPC via push bridge.
+    # Relays messages from the PULL socket to a PUB socket connected to the backbone.
+    # zmq.proxy does this in libzmq without handling each message in Python.
+    pub_bridge_socket = zmq_ctx.socket(zmq.PUB)
+    pub_bridge_socket.connect(ipc_pub_url)
+    pull_pub = Thread(
+        target=zmq.proxy, args=(pull_socket, pub_bridge_socket), daemon=True
+    )
     pull_pub.start()
 
         # Initiates a logging thread which sets up logging handlers (file and console) and listens for logging messages on a ZMQ SUB socket. It processes these messages and logs them appropriately.
     log_thread = Thread(
-        target=log_loop, args=(ipc_sub_url, parsed_args.debug), daemon=True
+        target=log_loop,
+        args=(zmq_ctx, ipc_sub_url, parsed_args.debug),
+        daemon=True,
     )
     log_thread.start()
 
         # tarts a thread for handling delayed notifications. It listens for specific messages and dispatches them after a delay, as specified in the messages.
     delay_thread = Thread(
-        target=delay_proxy, args=(ipc_push_url, ipc_sub_url), daemon=True
+        target=delay_proxy, args=(zmq_ctx, ipc_push_url, ipc_sub_url), daemon=True
     )
     delay_thread.start()
 
-    del xsub_socket, xpub_socket, pull_socket
+    del xsub_socket, xpub_socket, pull_socket, pub_bridge_socket
 
     #  Each topic typically corresponds to a different function or component in the system
+    # Only subscribe to what process_notification() handles, such that other
+    # notifications are already filtered out by zmq.
     topics = (
-        "notify.eye_process.",
-        "notify.player_process.",
-        "notify.world_process.",
-        "notify.service_process",
-        "notify.clear_settings_process.",
-        "notify.player_drop_process.",
-        "notify.launcher_process.",
+        "notify.eye_process.should_start",
+        "notify.eye_process.stopped",
+        "notify.player_process.should_start",
+        "notify.world_process.should_start",
+        "notify.service_process.should_start",
+        "notify.clear_settings_process.should_start",
+        "notify.player_drop_process.should_start",
+        "notify.launcher_process.should_stop",
         "notify.meta.should_doc",
         "notify.circle_detector_process.should_start",
         "notify.ipc_startup",
@@ -491,6 +491,11 @@ def process_notification(
             name="circle_detector",
             args=(ipc_push_url, notification["pair_url"], notification["source_path"]),
         ).start()
+    elif topic == "notify.eye_process.stopped":
+        # The stopped eye process waits for this before it exits
+        cmd_push.notify(
+            {"subject": f"eye_process.stopped.ack.{notification['eye_id']}"}
+        )
     elif "notify.meta.should_doc" in topic:
         cmd_push.notify(
             {
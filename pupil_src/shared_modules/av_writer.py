@@ -14,6 +14,8 @@ import logging
 import math
 import multiprocessing as mp
 import os
+import queue
+import threading
 import typing as T
 from fractions import Fraction
 
@@ -248,6 +250,15 @@ class AV_Writer(abc.ABC):
         """
         pass
 
+    def prepare_frame(self, input_frame) -> None:
+        """
+        Called by Async_Writer on the capturing thread before the frame is queued.
+
+        Overwrite to compute lazily converted frame data that encode_frame() reads,
+        such that the writer thread only reads data that is not modified anymore.
+        """
+        pass
+
     @abc.abstractmethod
     def encode_frame(self, input_frame, pts: int) -> T.Iterator[Packet]:
         """Encode a frame into one or multiple av packets with given pts."""
@@ -263,6 +274,76 @@ class AV_Writer(abc.ABC):
         """Desired video stream codec."""
 
 
+class Async_Writer:
+    """Wraps a writer and moves the frame writing onto a background thread.
+
+    write_video_frame() only enqueues the frame, such that the calling loop does not
+    stall on encoding and disk I/O. The queue is bounded: if the writer thread falls
+    behind, the caller blocks until there is space again, as recorded frames must not
+    be dropped.
+
+    The caller keeps using the frames (e.g. for rendering) while the writer thread
+    encodes them, so the writer thread must only read frame data that is never
+    computed or modified after enqueueing. To that end, the wrapped writer's
+    prepare_frame() (see AV_Writer) is called on the caller thread before a frame is
+    queued, e.g. MPEG_Writer forces the lazy YUV/BGR conversion of UVC frames there.
+    Writers without prepare_frame(), like ndsi's H264Writer, must only read
+    immutable data such as encoded buffers.
+
+    The first exception raised by the wrapped writer stops the writing. It is
+    re-raised on the next call to write_video_frame(), or logged by release() if no
+    further frame was written. Frames queued after the failure are discarded.
+    """
+
+    def __init__(self, writer, max_queued_frames: int = 64):
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=max_queued_frames)
+        self._error = None
+        self._error_reported = False
+        self._prepare_frame = getattr(writer, "prepare_frame", None)
+        self._thread = threading.Thread(target=self._write_queued_frames, daemon=True)
+        self._thread.start()
+
+    def write_video_frame(self, input_frame):
+        if self._error is not None and not self._error_reported:
+            self._error_reported = True
+            raise self._error
+        if self._prepare_frame is not None:
+            self._prepare_frame(input_frame)
+        try:
+            self._queue.put_nowait(input_frame)
+        except queue.Full:
+            logger.debug("Writer thread is falling behind. Waiting for it to catch up.")
+            self._queue.put(input_frame)
+
+    def release(self):
+        """Write all queued frames and release the wrapped writer."""
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            self._writer.release()
+        finally:
+            if self._error is not None and not self._error_reported:
+                self._error_reported = True
+                logger.error(
+                    f"Writing queued video frames failed: {self._error}",
+                    exc_info=self._error,
+                )
+
+    def _write_queued_frames(self):
+        while True:
+            input_frame = self._queue.get()
+            if input_frame is None:
+                return
+            if self._error is not None:
+                # keep draining the queue such that the caller does not block
+                continue
+            try:
+                self._writer.write_video_frame(input_frame)
+            except Exception as err:
+                self._error = err
+
+
 class MPEG_Writer(AV_Writer):
     """AV_Writer with MPEG4 encoding."""
 
@@ -283,6 +364,14 @@ class MPEG_Writer(AV_Writer):
         self.frame = av.VideoFrame(input_frame.width, input_frame.height, pix_format)
         self.frame.time_base = self.time_base
 
+    def prepare_frame(self, input_frame) -> None:
+        # UVC frames decode yuv422/img lazily with the capture's shared turbojpeg
+        # handle, which must not run concurrently with the render path
+        if input_frame.yuv_buffer is not None:
+            input_frame.yuv422
+        else:
+            input_frame.img
+
     def encode_frame(self, input_frame, pts: int) -> T.Iterator[Packet]:
         if input_frame.yuv_buffer is not None:
             y, u, v = input_frame.yuv422
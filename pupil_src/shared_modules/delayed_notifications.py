@@ -0,0 +1,70 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+import heapq
+import itertools
+import typing as T
+
+TOPIC_CUTOFF = len("delayed_")
+
+
+class Delayed_Notifications:
+    """Holds `delayed_notify` notifications until their delay has passed.
+
+    A notification replaces a waiting notification with the same subject. Due
+    notifications are found via a heap of (notify time, sequence number,
+    notification). Entries of replaced notifications stay in the heap and are
+    skipped once they reach its top.
+    """
+
+    def __init__(self):
+        self._waiting = {}
+        self._notify_times = []
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._waiting)
+
+    def add(self, notification: dict, now: float):
+        notify_time = now + notification["delay"]
+        self._waiting[notification["subject"]] = notification
+        heapq.heappush(
+            self._notify_times, (notify_time, next(self._sequence), notification)
+        )
+
+    def seconds_until_next(self, now: float) -> T.Optional[float]:
+        """Time until the next notification is due, or None if none is waiting."""
+        self._drop_replaced()
+        if not self._notify_times:
+            return None
+        return max(self._notify_times[0][0] - now, 0.0)
+
+    def pop_due(self, now: float) -> T.List[dict]:
+        """Remove and return all due notifications, ready to be sent.
+
+        Their topic is stripped of the `delayed_` prefix and the `delay` is removed.
+        """
+        due = []
+        self._drop_replaced()
+        while self._notify_times and self._notify_times[0][0] <= now:
+            _, _, n = heapq.heappop(self._notify_times)
+            del self._waiting[n["subject"]]
+            n["topic"] = n["topic"][TOPIC_CUTOFF:]
+            del n["delay"]
+            due.append(n)
+            self._drop_replaced()
+        return due
+
+    def _drop_replaced(self):
+        while self._notify_times:
+            n = self._notify_times[0][2]
+            if self._waiting.get(n["subject"]) is n:
+                return
+            heapq.heappop(self._notify_times)
@@ -14,6 +14,7 @@ import copy
 import logging
 import os
 import pickle
+import threading
 import traceback as tb
 import types
 from glob import iglob
@@ -35,11 +36,12 @@ PLData = collections.namedtuple("PLData", ["data", "timestamps", "topics"])
 
 
 class Persistent_Dict(dict):
-    """a dict class that uses pickle to save inself to file"""
+    """a dict class that uses msgpack to save inself to file"""
 
     def __init__(self, file_path, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.file_path = os.path.expanduser(file_path)
+        self._save_thread = None
         try:
             if os.path.getsize(file_path) > 0:
                 # Only try to load object if file is not empty
@@ -57,16 +59,38 @@ class Persistent_Dict(dict):
             logger.debug(tb.format_exc())
 
     def save(self):
-        d = {}
-        d.update(self)
+        self._write(_pack_object(dict(self)))
+
+    def save_in_background(self):
+        """
+        Serialize the current content and write it to disk in a background thread.
+        Call `wait_for_save()` before the process exits.
+        """
+        self.wait_for_save()
+        data = _pack_object(dict(self))
+        self._save_thread = threading.Thread(
+            target=self._write, args=(data,), name="Persistent_Dict save"
+        )
+        self._save_thread.start()
+
+    def wait_for_save(self):
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+
+    def _write(self, data):
         try:
-            save_object(d, self.file_path)
+            _write_file_atomically(data, self.file_path)
         except PermissionError:
             logger.warning(
                 f"Permission denied when trying to write to file: {self.file_path}"
             )
+        except OSError as err:
+            logger.error(f"Could not write to file: {self.file_path} ({err})")
+            logger.debug(tb.format_exc())
 
     def close(self):
+        self.wait_for_save()
         self.save()
 
 
@@ -100,23 +124,38 @@ def load_object(file_path, allow_legacy=True):
     return data
 
 
-def save_object(object_, file_path):
-    def ndarrray_to_list(
-        o, _warned=[False]
-    ):  # Use a mutlable default arg to hold a fn interal temp var.
-        if isinstance(o, np.ndarray):
-            if not _warned[0]:
-                logger.warning(
-                    "numpy array will be serialized as list. Invoked at:\n"
-                    + "".join(tb.format_stack())
-                )
-                _warned[0] = True
-            return o.tolist()
-        return o
+def _ndarrray_to_list(
+    o, _warned=[False]
+):  # Use a mutlable default arg to hold a fn interal temp var.
+    if isinstance(o, np.ndarray):
+        if not _warned[0]:
+            logger.warning(
+                "numpy array will be serialized as list. Invoked at:\n"
+                + "".join(tb.format_stack())
+            )
+            _warned[0] = True
+        return o.tolist()
+    return o
+
+
+def _pack_object(object_):
+    return msgpack.packb(object_, use_bin_type=True, default=_ndarrray_to_list)
+
 
+def _write_file_atomically(data, file_path):
+    # Write to a temporary file first such that an interrupted write does not leave
+    # a truncated file behind.
+    file_path = Path(file_path).expanduser()
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, file_path)
+
+
+def save_object(object_, file_path):
     file_path = Path(file_path).expanduser()
     with file_path.open("wb") as fh:
-        msgpack.pack(object_, fh, use_bin_type=True, default=ndarrray_to_list)
+        msgpack.pack(object_, fh, use_bin_type=True, default=_ndarrray_to_list)
 
 
 class Incremental_Legacy_Pupil_Data_Loader:
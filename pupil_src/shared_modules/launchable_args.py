@@ -70,9 +70,17 @@ class PupilArgParser:
         # help: 用于生成帮助消息的子命令的简短描述
         subparser.required = True
 
+        # Only the app selected on the command line (the first positional argument)
+        # needs its arguments. The other apps are added by name only, such that they
+        # are still listed in the help message. All apps are fully built if none of
+        # them was selected, e.g. for a bare `-h`.
+        selected_app = next((arg for arg in sys.argv[1:] if arg in self.apps), None)
+
         # 子解析器的名称是应用程序的名称（例如，"capture"、"player"、"service"）。
         for app, description in self.apps.items():
             app_parser = subparser.add_parser(app, help=description)
+            if selected_app is not None and app != selected_app:
+                continue
             # general args are added to each app
             self._add_general_args(app_parser)
             # app specific args are added to each app
@@ -360,8 +360,12 @@ class Plugin_List:
     removing Plugins and lacking most other list methods.
     """
 
+    # input events that are dispatched only to plugins overriding the handler
+    _dispatched_events = ("on_click", "on_pos", "on_key", "on_char", "on_drop")
+
     def __init__(self, g_pool, plugin_initializers):
         self._plugins = []
+        self.by_event = {event: [] for event in self._dispatched_events}
         self.g_pool = g_pool
         plugin_by_name = g_pool.plugin_by_name
 
@@ -438,6 +442,7 @@ class Plugin_List:
 
         self._plugins.append(plugin_instance)
         self._plugins.sort(key=lambda p: p.order)
+        self._update_event_handlers()
 
         if self.g_pool.app in ("capture", "player") or "eye" in self.g_pool.process:
             plugin_instance.init_ui()
@@ -492,6 +497,21 @@ class Plugin_List:
                 p.cleanup()
                 logger.debug(f"Unloaded Plugin: {p}")
                 self._plugins.remove(p)
+        self._update_event_handlers()
+
+    def _update_event_handlers(self):
+        """
+        Rebuild `by_event`, which maps each input event to the plugins (in order)
+        that override the corresponding no-op handler of the Plugin base class.
+        """
+        self.by_event = {
+            event: [
+                p
+                for p in self._plugins
+                if getattr(type(p), event) is not getattr(Plugin, event)
+            ]
+            for event in self._dispatched_events
+        }
 
     def get_initializers(self):
         initializers = []
@@ -2,6 +2,7 @@
 # Changes, Additions: Moritz Kassner <moritz@pupil-labs.com>, Will Patera <will@pupil-labs.com>
 # This file is placed into the public domain.
 
+import functools
 import logging
 import os
 import pathlib
@@ -14,9 +15,12 @@ import packaging.version
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def get_tag_commit() -> T.Optional[str]:
     """
     returns string: 'tag'-'commits since tag'-'7 digit commit id'
+
+    git is only called once per process. Failures (None) are cached as well.
     """
     try:
         # run command: git describe --tags --long at absolute path of this file
@@ -42,6 +46,9 @@ ParsedVersion = T.Union[packaging.version.LegacyVersion, packaging.version.Versi
 
 
 # Parse the given version string and return either a :class:`Version` object or a :class:`LegacyVersion` object
+# Cached, since the same few version strings are parsed over and over again. The
+# returned objects are immutable and safe to share.
+@functools.lru_cache(maxsize=64)
 def parse_version(vstring: str) -> ParsedVersion:
     return packaging.version.parse(vstring)
 
@@ -50,6 +57,7 @@ def pupil_version() -> ParsedVersion:
     return parse_version(pupil_version_string())
 
 
+@functools.lru_cache(maxsize=1)
 def pupil_version_string() -> str:
     """
     [major].[minor].[trailing-untagged-commits]
@@ -62,13 +70,15 @@ def pupil_version_string() -> str:
     if version is None:
         raise ValueError("Version Error")
 
+    parts_git_tag = version.split("-")
     try:
-        parts_git_tag = version.split("-")
         version_parsed = packaging.version.Version(parts_git_tag[0])
-        if version_parsed.is_prerelease:
-            version = version_parsed.base_version
     except packaging.version.InvalidVersion:
-        pass
+        is_prerelease = False
+    else:
+        is_prerelease = version_parsed.is_prerelease
+    if is_prerelease:
+        version = version_parsed.base_version
     # delete the leading 'v' from the version string
         # for instance, 'v0.9.0-1-ga1b2c3d' -> '0.9.0-1-ga1b2c3d'
     version = version.replace("v", "")  # strip version 'v'
@@ -80,17 +90,23 @@ def pupil_version_string() -> str:
         parts = version.split("-")
         version = ".".join(parts[:-1])
     # if the version is a prerelease, append the prerelease tag
-    if version_parsed.is_prerelease:
+    if is_prerelease:
         version += "".join(map(str, version_parsed.pre))
     return version
 
 
+@functools.lru_cache(maxsize=1)
+def _read_bundled_version_string() -> str:
+    # written to the bundle by write_version_file() and does not change at runtime
+    version_file = os.path.join(sys._MEIPASS, "_version_string_")
+    with open(version_file) as f:
+        return f.read()
+
+
 def get_version():
     # get the current software version
     if getattr(sys, "frozen", False):
-        version_file = os.path.join(sys._MEIPASS, "_version_string_")
-        with open(version_file) as f:
-            version_string = f.read()
+        version_string = _read_bundled_version_string()
     # running from source
     else:
         version_string = pupil_version_string()
@@ -101,12 +117,11 @@ def get_version():
 
 def write_version_file(target_dir: str) -> pathlib.Path:
     version_string = pupil_version_string()
-    version_file = os.path.join(target_dir, "_version_string_")
+    version_file = pathlib.Path(target_dir) / "_version_string_"
     logger.debug(f"Writing Pupil Core version '{version_string}' to {version_file}")
-    with open(version_file, "w") as f:
-        f.write(version_string)
+    version_file.write_text(version_string)
     # return the path to the version file
-    return pathlib.Path(version_file)
+    return version_file
 
 
 if __name__ == "__main__":
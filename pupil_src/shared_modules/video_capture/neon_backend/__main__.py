@@ -1,12 +1,20 @@
 # __main__.py, which will be executed when the module is run with -m. ex. python -m package
 import contextlib
 import ctypes
+import logging
 import multiprocessing
 import os
 import pathlib
 import sys
+from threading import Thread
+from time import time
 from typing import Tuple
 
+import zmq  # ZeroMQ 是一个高性能的异步消息库，用于构建分布式或并发应用。
+import zmq_tools
+from delayed_notifications import Delayed_Notifications
+from rich.logging import RichHandler
+
 from .background import BackgroundCameraSharingManager
 from .definitions import NEON_SHARED_EYE_FRAME_TOPIC
 
@@ -33,10 +41,6 @@ def main():
 
 
 def ipc() -> Tuple[str, str, str]:
-    from threading import Thread
-
-    import zmq # ZeroMQ 是一个高性能的异步消息库，用于构建分布式或并发应用。
-
     zmq_ctx = zmq.Context()
 
     # Let the OS choose the IP and PORT
@@ -101,8 +105,6 @@ def ipc() -> Tuple[str, str, str]:
 
 # Reliable msg dispatch to the IPC via push bridge.
 def pull_pub_thread(ipc_pub_url, pull):
-    import zmq
-
     # 创建了一个 ZeroMQ 上下文
     ctx = zmq.Context.instance()
     # ZeroMQ PUB 套接字。PUB 套接字用于发布消息，任何连接到它的 SUB 套接字都可以接收到这些消息
@@ -110,19 +112,13 @@ def pull_pub_thread(ipc_pub_url, pull):
     # 将 PUB 套接字连接到指定的 URL
     pub.connect(ipc_pub_url)
 
-    while True:
-        """收到一个消息，然后群发给所有连接到这个 PUB 套接字的 SUB 套接字"""
-        # 从 PULL 套接字接收一个多部分的消息。在 ZeroMQ 中，你可以发送和接收由多个部分组成的消息，这对于发送复杂的数据结构非常有用。
-        m = pull.recv_multipart()
-        # 通过 PUB 套接字发送接收到的多部分消息。所有连接到这个 PUB 套接字的 SUB 套接字都会接收到这个消息。
-        pub.send_multipart(m)
+    # 把 PULL 套接字收到的多部分消息原样转发给 PUB 套接字。
+    # zmq.proxy 在 C 代码中循环转发，不会为每条消息回到 Python 解释器。
+    zmq.proxy(pull, pub)
 
 
 # The delay proxy handles delayed notififications.
 def delay_proxy_thread(ipc_pub_url, ipc_sub_url):
-    import zmq
-    import zmq_tools
-
     ctx = zmq.Context.instance()
     # 只会接收主题为 "delayed_notify"的消息
     sub = zmq_tools.Msg_Receiver(ctx, ipc_sub_url, ("delayed_notify",))
@@ -130,37 +126,28 @@ def delay_proxy_thread(ipc_pub_url, ipc_sub_url):
     # Poller 对象用于监视套接字的状态，当套接字有数据可读时，poller.poll() 方法会返回 True。
     poller = zmq.Poller()
     poller.register(sub.socket, zmq.POLLIN)
-    # 一个空字典，用于存储待发送的延迟通知。
-    waiting_notifications = {}
-
-    TOPIC_CUTOFF = len("delayed_")
+    # 存储待发送的延迟通知。相同主题的新通知会替换旧通知。
+    delayed_notifications = Delayed_Notifications()
 
     while True:
-        # 如果 SUB 套接字有数据可读，那么接收新的延迟通知，并将其存储在字典中。通知的发送时间是当前时间加上延迟时间。
-        if poller.poll(timeout=250):
+        # 等待新消息，最多等到下一个通知的发送时间
+        timeout = 250
+        time_to_next = delayed_notifications.seconds_until_next(time())
+        if time_to_next is not None:
+            timeout = min(timeout, time_to_next * 1000)
+        # 如果 SUB 套接字有数据可读，那么接收新的延迟通知。通知的发送时间是当前时间加上延迟时间。
+        if poller.poll(timeout=timeout):
             # Recv new delayed notification and store it.
             topic, n = sub.recv()
-            n["__notify_time__"] = time() + n["delay"]
-            waiting_notifications[n["subject"]] = n
-        # When a notifications time has come, pop from dict and send it as notification
-        # 遍历字典中的所有通知，如果通知的发送时间已经到达，那么从字典中删除该通知，并通过 PUB 套接字发送出去。
-        for s, n in list(waiting_notifications.items()):
-            if n["__notify_time__"] < time():
-                n["topic"] = n["topic"][TOPIC_CUTOFF:]
-                del n["__notify_time__"]
-                del n["delay"]
-                del waiting_notifications[s]
-                pub.notify(n)
+            delayed_notifications.add(n, time())
+        # When a notifications time has come, send it as notification
+        # 发送时间已经到达的通知通过 PUB 套接字发送出去。
+        for n in delayed_notifications.pop_due(time()):
+            pub.notify(n)
 
 
 # Recv log records from other processes.
 def log_loop_thread(ipc_sub_url, log_level_debug):
-    import logging
-
-    import zmq
-    import zmq_tools
-    from rich.logging import RichHandler
-
     # Get the root logger
     logger = logging.getLogger()
     # set log level
@@ -133,7 +133,7 @@ class BackgroundCameraSharingManager:
                         notification["subject"]
                         == NEON_SHARED_CAM_STATE_CHANGE_REQUEST_TOPIC
                     ):
-                        network.logger.debug(f"Received {notification}")
+                        network.logger.debug("Received %s", notification)
                         if camera is not None:
                             camera.controls = notification
                             network.announce_camera_state(camera.controls)
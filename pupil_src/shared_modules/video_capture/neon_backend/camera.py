@@ -139,9 +139,16 @@ class NeonCameraInterface:
             )
             return
 
-        width_half = gray_frame_cached.shape[1] // 2
-        left_data = gray_frame_cached[:, :width_half]
-        right_data = gray_frame_cached[:, width_half:]
+        height, width = gray_frame_cached.shape[:2]
+        width_half = width // 2
+        if width % 2 == 0:
+            # 一次拷贝得到两个连续的半帧, send_image 中不再需要逐个拷贝
+            left_data, right_data = np.ascontiguousarray(
+                gray_frame_cached.reshape(height, 2, width_half).transpose(1, 0, 2)
+            )
+        else:
+            left_data = gray_frame_cached[:, :width_half]
+            right_data = gray_frame_cached[:, width_half:]
 
         return SplitSharedFrame(
             left=NeonCameraInterface.frame_from_template(shared_frame, left_data),
@@ -27,6 +27,11 @@ class NetworkInterface:
         setup_zmq_handler: bool = True,
     ):
         self.topic_prefix = topic_prefix
+        topic_prefix_bytes = topic_prefix.encode()
+        self._subscribe_prefix = b"\x01" + topic_prefix_bytes
+        self._unsubscribe_prefix = b"\x00" + topic_prefix_bytes
+        # 每个眼睛的帧主题, 避免每帧重新拼接字符串
+        self._eye_frame_topics = (topic_prefix + "eye0", topic_prefix + "eye1")
         self.num_subscribers = 0
         self._setup_networking(
             ipc_pub_url=ipc_pub_url, ipc_sub_url=ipc_sub_url, ipc_push_url=ipc_push_url
@@ -81,48 +86,6 @@ class NetworkInterface:
         # create logger for the context of this function
         self.logger = logging.getLogger(__name__ + ".background")
 
-    def split_and_send_eye_images(
-        self,
-        shared_frame: "GrayFrameProtocol",
-        intrinsics_left: Intrinsics,
-        intrinsics_right: Intrinsics,
-        timestamp_offset: float = 0.0,
-    ):
-        gray_frame_cached = shared_frame.gray
-
-        """
-        it checks if the entire frame data has been received. 
-        If not, it logs a debug message and exits the function early.
-        """
-
-        if not shared_frame.data_fully_received:
-            self.logger.debug("Frame data not fully received. Dropping.")
-            return
-
-        # split the frame into two images (by width) and send them
-        width_half = gray_frame_cached.shape[1] // 2
-        left_frame = gray_frame_cached[:, :width_half]
-        right_frame = gray_frame_cached[:, width_half:]
-
-        self.send_image(
-            image=left_frame,
-            projection_matrix=intrinsics_left.projection_matrix,
-            distortion_coeffs=intrinsics_left.distortion_coeffs,
-            format_="gray",
-            index=shared_frame.index,
-            timestamp=shared_frame.timestamp - timestamp_offset,
-            topic=self.topic_prefix + "eye1",
-        )
-        self.send_image(
-            image=right_frame,
-            projection_matrix=intrinsics_right.projection_matrix,
-            distortion_coeffs=intrinsics_right.distortion_coeffs,
-            format_="gray",
-            index=shared_frame.index,
-            timestamp=shared_frame.timestamp - timestamp_offset,
-            topic=self.topic_prefix + "eye0",
-        )
-
     def send_eye_frame(
         self,
         frame: GrayFrameProtocol,
@@ -137,7 +100,7 @@ class NetworkInterface:
             format_="gray",
             index=frame.index,
             timestamp=frame.timestamp,
-            topic=self.topic_prefix + f"eye{eye_id}",
+            topic=self._eye_frame_topics[eye_id],
         )
 
     def send_image(
@@ -160,6 +123,9 @@ class NetworkInterface:
         attribu:: topic 主题: str
         """
         height, width, *_ = image.shape
+        # 只有带步长的视图 (例如奇数宽度的半帧) 才需要拷贝成连续内存
+        if not image.flags.c_contiguous:
+            image = np.ascontiguousarray(image)
         self.ipc_pub.send(
             {
                 "format": format_,
@@ -170,26 +136,35 @@ class NetworkInterface:
                 "height": height,
                 "index": index,
                 "timestamp": timestamp,
-                "__raw_data__": [np.ascontiguousarray(image)],
-            }
+                "__raw_data__": [image],
+            },
+            # 零拷贝发送; zmq 持有缓冲区引用直到发送完成
+            copy=False,
         )
 
     def process_subscriptions(self):
-        # ipc_pub 的 socket 是否有输入事件
-        while self.ipc_pub.socket.get(zmq.EVENTS) & zmq.POLLIN:
-            # 如果有，它会接收多部分消息
-            subscription, *_ = self.ipc_pub.socket.recv_multipart()
+        # 非阻塞地读取 ipc_pub 的 socket 上所有待处理的订阅消息
+        while True:
+            try:
+                subscription, *_ = self.ipc_pub.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
             # 如果订阅的主题以 0x01 开头，它会增加订阅者的数量
-            if subscription.startswith(b"\x01" + self.topic_prefix.encode()):
+            if subscription.startswith(self._subscribe_prefix):
                 self.num_subscribers += 1
             # 如果订阅的主题以 0x00 开头，它会减少订阅者的数量
-            elif subscription.startswith(b"\x00" + self.topic_prefix.encode()):
+            elif subscription.startswith(self._unsubscribe_prefix):
                 self.num_subscribers = max(self.num_subscribers - 1, 0)
 
     def process_notifications(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
         # 用于处理通知的函数，它会在每次调用时返回一个迭代器. 如果有通知，它会接收并返回消息。
-        while self.notify_sub.socket.get(zmq.EVENTS) & zmq.POLLIN:
-            yield self.notify_sub.recv()
+        while True:
+            try:
+                topic = self.notify_sub.socket.recv_string(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            remaining_frames = self.notify_sub.recv_remaining_frames()
+            yield topic, self.notify_sub.deserialize_payload(*remaining_frames)
 
     def announce_camera_state(self, state: Dict[str, Any]):
         """
@@ -200,5 +175,5 @@ class NetworkInterface:
             "connected": bool(state),
             **state,
         }
-        self.logger.debug(f"Announcing {notification}")
+        self.logger.debug("Announcing %s", notification)
         self.notify_push.notify(notification)
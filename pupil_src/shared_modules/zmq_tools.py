@@ -148,8 +148,9 @@ class Msg_Streamer(ZMQ_Socket):
             self.socket.set_hwm(hwm)
 
         self.socket.connect(url)
+        self.packer = serializer.Packer(use_bin_type=True)
 
-    def send(self, payload, deprecated=()):
+    def send(self, payload, deprecated=(), *, copy: bool = True):
         """Send a message with topic, payload
 
         Topic is a unicode string. It will be sent as utf-8 encoded byte array.
@@ -160,6 +161,10 @@ class Msg_Streamer(ZMQ_Socket):
         everything else need to be serializable
         the contents of the iterable in '__raw_data__'
         require exposing the pyhton memoryview interface.
+
+        With copy=False the raw data buffers are handed to zmq without copying them.
+        The caller must not modify them afterwards, since zmq sends them later from
+        its I/O thread.
         """
         assert deprecated == (), "Depracted use of send()"
         assert "topic" in payload, f"`topic` field required in {payload}"
@@ -167,18 +172,18 @@ class Msg_Streamer(ZMQ_Socket):
         if "__raw_data__" not in payload:
             # IMPORTANT: serialize first! Else if there is an exception
             # the next message will have an extra prepended frame
-            serialized_payload = serializer.packb(payload, use_bin_type=True)
+            serialized_payload = self.packer.pack(payload)
             self.socket.send_string(payload["topic"], flags=zmq.SNDMORE)
             self.socket.send(serialized_payload)
         else:
             extra_frames = payload.pop("__raw_data__")
             assert isinstance(extra_frames, (list, tuple))
             self.socket.send_string(payload["topic"], flags=zmq.SNDMORE)
-            serialized_payload = serializer.packb(payload, use_bin_type=True)
+            serialized_payload = self.packer.pack(payload)
             self.socket.send(serialized_payload, flags=zmq.SNDMORE)
             for frame in extra_frames[:-1]:
-                self.socket.send(frame, flags=zmq.SNDMORE, copy=True)
-            self.socket.send(extra_frames[-1], copy=True)
+                self.socket.send(frame, flags=zmq.SNDMORE, copy=copy)
+            self.socket.send(extra_frames[-1], copy=copy)
 
 
 class Msg_Dispatcher(Msg_Streamer):
@@ -190,6 +195,7 @@ class Msg_Dispatcher(Msg_Streamer):
     def __init__(self, ctx, url):
         self.socket = zmq.Socket(ctx, zmq.PUSH)
         self.socket.connect(url)
+        self.packer = serializer.Packer(use_bin_type=True)
 
     def notify(self, notification):
         """Send a pupil notification.
@@ -221,6 +227,7 @@ class Msg_Pair_Server(Msg_Pair_Base):
     def __init__(self, ctx, url="tcp://*:*"):
         self.socket = zmq.Socket(ctx, zmq.PAIR)
         self.socket.bind(url)
+        self.packer = serializer.Packer(use_bin_type=True)
 
     @property
     def url(self):
@@ -246,3 +253,4 @@ class Msg_Pair_Client(Msg_Pair_Base):
             self.socket.disable_monitor()
         else:
             self.socket.connect(url)
+        self.packer = serializer.Packer(use_bin_type=True)
@@ -0,0 +1,108 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+import logging
+import threading
+import time
+
+import pytest
+from av_writer import Async_Writer
+
+
+class WriteFailed(Exception):
+    pass
+
+
+class FakeWriter:
+    def __init__(self, fail_on=(), gate=None):
+        self.fail_on = set(fail_on)
+        self.gate = gate
+        self.written = []
+        self.released = False
+
+    def write_video_frame(self, input_frame):
+        if self.gate is not None:
+            self.gate.wait()
+        self.written.append(input_frame)
+        if input_frame in self.fail_on:
+            raise WriteFailed(f"failed on frame {input_frame}")
+
+    def release(self):
+        self.released = True
+
+
+def test_async_writer_writes_frames_in_order():
+    fake = FakeWriter()
+    writer = Async_Writer(fake, max_queued_frames=4)
+    for frame in range(100):
+        writer.write_video_frame(frame)
+    writer.release()
+
+    assert fake.written == list(range(100))
+    assert fake.released
+
+
+def test_async_writer_raises_first_error_on_next_write(caplog):
+    fake = FakeWriter(fail_on=(0, 1))
+    writer = Async_Writer(fake)
+    writer.write_video_frame(0)
+
+    with pytest.raises(WriteFailed) as excinfo:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            writer.write_video_frame(1)
+            time.sleep(0.01)
+    assert str(excinfo.value) == "failed on frame 0"
+
+    with caplog.at_level(logging.ERROR):
+        writer.release()
+    # writing stopped after the first error, which was reported only once
+    assert fake.written == [0]
+    assert fake.released
+    assert not caplog.records
+
+
+def test_async_writer_release_logs_pending_error(caplog):
+    # hold back the writer thread until all frames are queued
+    gate = threading.Event()
+    fake = FakeWriter(fail_on=(2, 4), gate=gate)
+    writer = Async_Writer(fake)
+    for frame in range(6):
+        writer.write_video_frame(frame)
+    gate.set()
+
+    with caplog.at_level(logging.ERROR):
+        writer.release()
+
+    assert fake.written == [0, 1, 2]
+    assert fake.released
+    assert len(caplog.records) == 1
+    assert "failed on frame 2" in caplog.records[0].getMessage()
+
+
+class PreparingFakeWriter(FakeWriter):
+    def __init__(self):
+        super().__init__()
+        self.prepared_on = []
+
+    def prepare_frame(self, input_frame):
+        self.prepared_on.append((input_frame, threading.current_thread()))
+
+
+def test_async_writer_prepares_frames_on_caller_thread():
+    fake = PreparingFakeWriter()
+    writer = Async_Writer(fake)
+    for frame in range(10):
+        writer.write_video_frame(frame)
+    writer.release()
+
+    caller = threading.current_thread()
+    assert fake.prepared_on == [(frame, caller) for frame in range(10)]
+    assert fake.written == list(range(10))
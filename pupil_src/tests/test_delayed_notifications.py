@@ -0,0 +1,66 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+from delayed_notifications import Delayed_Notifications
+
+
+def delayed(subject, delay, **kwargs):
+    return {
+        "topic": f"delayed_notify.{subject}",
+        "subject": subject,
+        "delay": delay,
+        **kwargs,
+    }
+
+
+def test_pop_due_in_notify_time_order():
+    notifications = Delayed_Notifications()
+    notifications.add(delayed("b", 2.0), now=0.0)
+    notifications.add(delayed("a", 1.0), now=0.0)
+    notifications.add(delayed("c", 3.0), now=0.0)
+
+    assert notifications.pop_due(0.5) == []
+    assert notifications.seconds_until_next(0.5) == 0.5
+
+    due = notifications.pop_due(2.5)
+    assert [n["subject"] for n in due] == ["a", "b"]
+    assert due[0] == {"topic": "notify.a", "subject": "a"}
+    assert len(notifications) == 1
+
+    assert [n["subject"] for n in notifications.pop_due(3.0)] == ["c"]
+    assert notifications.seconds_until_next(3.0) is None
+    assert len(notifications) == 0
+
+
+def test_same_subject_replaces_waiting_notification():
+    notifications = Delayed_Notifications()
+    notifications.add(delayed("a", 1.0, value="old"), now=0.0)
+    # re-sent before it is due, with a later notify time
+    notifications.add(delayed("a", 1.0, value="new"), now=0.5)
+    assert len(notifications) == 1
+
+    # the replaced entry neither fires at its own time nor shortens the timeout
+    assert notifications.seconds_until_next(1.0) == 0.5
+    assert notifications.pop_due(1.2) == []
+
+    due = notifications.pop_due(1.5)
+    assert [n["value"] for n in due] == ["new"]
+    assert notifications.pop_due(10.0) == []
+
+
+def test_replacement_with_earlier_notify_time():
+    notifications = Delayed_Notifications()
+    notifications.add(delayed("a", 5.0, value="old"), now=0.0)
+    notifications.add(delayed("a", 1.0, value="new"), now=0.0)
+
+    assert [n["value"] for n in notifications.pop_due(1.0)] == ["new"]
+    # the stale entry of the old notification does not fire later on
+    assert notifications.pop_due(5.0) == []
+    assert notifications.seconds_until_next(5.0) is None
@@ -0,0 +1,46 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+import pytest
+from file_methods import Persistent_Dict
+
+
+@pytest.fixture
+def settings_path(tmp_path):
+    return tmp_path / "user_settings_eye0"
+
+
+def test_persistent_dict_save_in_background_round_trip(settings_path):
+    settings = Persistent_Dict(settings_path)
+    settings["flip"] = True
+    settings["loaded_plugins"] = [["Pupil_Detector_2D", {"visible": False}]]
+
+    settings.save_in_background()
+    # changes after the call must not end up in the file
+    settings["flip"] = False
+    settings.wait_for_save()
+
+    loaded = Persistent_Dict(settings_path)
+    assert loaded == {
+        "flip": True,
+        "loaded_plugins": [["Pupil_Detector_2D", {"visible": False}]],
+    }
+    assert [p.name for p in settings_path.parent.iterdir()] == [settings_path.name]
+
+
+def test_persistent_dict_close_waits_for_background_save(settings_path):
+    settings = Persistent_Dict(settings_path)
+    settings["display_mode"] = "camera_image"
+    settings.save_in_background()
+    settings["display_mode"] = "algorithm"
+    settings.close()
+
+    assert Persistent_Dict(settings_path) == {"display_mode": "algorithm"}
+    assert [p.name for p in settings_path.parent.iterdir()] == [settings_path.name]
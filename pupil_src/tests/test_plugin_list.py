@@ -0,0 +1,113 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+from types import SimpleNamespace
+
+import pytest
+from plugin import Plugin, Plugin_List
+
+
+class Passive_Plugin(Plugin):
+    order = 0.5
+
+
+class Click_Plugin(Plugin):
+    order = 0.6
+
+    def on_click(self, pos, button, action):
+        return False
+
+
+class Early_Click_Plugin(Click_Plugin):
+    # inherits the on_click override
+    uniqueness = "not_unique"
+    order = 0.1
+
+
+class Key_Plugin(Plugin):
+    order = 0.3
+
+    def on_key(self, key, scancode, action, mods):
+        return False
+
+    def on_char(self, character):
+        return False
+
+
+class Other_Key_Plugin(Plugin):
+    uniqueness = "by_base_class"
+    order = 0.4
+
+    def on_key(self, key, scancode, action, mods):
+        return False
+
+
+@pytest.fixture
+def g_pool():
+    plugins = (
+        Passive_Plugin,
+        Click_Plugin,
+        Early_Click_Plugin,
+        Key_Plugin,
+        Other_Key_Plugin,
+    )
+    return SimpleNamespace(
+        app="test",
+        process="test",
+        plugin_by_name={p.__name__: p for p in plugins},
+    )
+
+
+def handler_classes(plugins, event):
+    return [type(p) for p in plugins.by_event[event]]
+
+
+def test_by_event_after_init(g_pool):
+    plugins = Plugin_List(
+        g_pool, [("Click_Plugin", {}), ("Passive_Plugin", {}), ("Key_Plugin", {})]
+    )
+    assert handler_classes(plugins, "on_click") == [Click_Plugin]
+    assert handler_classes(plugins, "on_key") == [Key_Plugin]
+    assert handler_classes(plugins, "on_char") == [Key_Plugin]
+    assert handler_classes(plugins, "on_pos") == []
+    assert handler_classes(plugins, "on_drop") == []
+
+
+def test_by_event_follows_add_and_order(g_pool):
+    plugins = Plugin_List(g_pool, [("Passive_Plugin", {})])
+    assert handler_classes(plugins, "on_click") == []
+
+    plugins.add(Click_Plugin)
+    assert handler_classes(plugins, "on_click") == [Click_Plugin]
+
+    # lower order is dispatched first
+    plugins.add(Early_Click_Plugin)
+    assert handler_classes(plugins, "on_click") == [Early_Click_Plugin, Click_Plugin]
+
+
+def test_by_event_follows_clean(g_pool):
+    plugins = Plugin_List(g_pool, [("Click_Plugin", {}), ("Key_Plugin", {})])
+    (click_plugin,) = plugins.by_event["on_click"]
+
+    click_plugin.alive = False
+    plugins.clean()
+    assert handler_classes(plugins, "on_click") == []
+    assert handler_classes(plugins, "on_key") == [Key_Plugin]
+
+
+def test_by_event_follows_replacement(g_pool):
+    plugins = Plugin_List(g_pool, [("Key_Plugin", {})])
+    (old_key_plugin,) = plugins.by_event["on_key"]
+
+    # replaces Key_Plugin, since both have Plugin as base class
+    plugins.add(Other_Key_Plugin)
+    assert not old_key_plugin.alive
+    assert handler_classes(plugins, "on_key") == [Other_Key_Plugin]
+    assert handler_classes(plugins, "on_char") == []
@@ -0,0 +1,45 @@
+"""
+(*)~---------------------------------------------------------------------------
+Pupil - eye tracking platform
+Copyright (C) Pupil Labs
+
+Distributed under the terms of the GNU
+Lesser General Public License (LGPL v3.0).
+See COPYING and COPYING.LESSER for license details.
+---------------------------------------------------------------------------~(*)
+"""
+import pytest
+import version_utils
+
+
+@pytest.fixture(autouse=True)
+def clear_version_caches():
+    def clear():
+        version_utils.get_tag_commit.cache_clear()
+        version_utils.pupil_version_string.cache_clear()
+        version_utils.parse_version.cache_clear()
+        version_utils._read_bundled_version_string.cache_clear()
+
+    clear()
+    yield
+    clear()
+
+
+@pytest.mark.parametrize(
+    "tag_commit, expected",
+    [
+        ("v2.1-5-gabc1234", "2.1.5"),
+        ("v2.0rc1-3-gabc1234", "2.0rc1"),
+        # not a valid version: used to raise NameError
+        ("foo-3-gabc", "foo.3"),
+    ],
+)
+def test_pupil_version_string(monkeypatch, tag_commit, expected):
+    monkeypatch.setattr(version_utils, "get_tag_commit", lambda: tag_commit)
+    assert version_utils.pupil_version_string() == expected
+
+
+def test_pupil_version_string_without_git(monkeypatch):
+    monkeypatch.setattr(version_utils, "get_tag_commit", lambda: None)
+    with pytest.raises(ValueError):
+        version_utils.pupil_version_string()